@@ -1,10 +1,15 @@
-from typing import Any, List
+import asyncio
+from collections import ChainMap
+from cachetools import TTLCache
+from typing import Any, List, Literal, NotRequired, TypedDict
+import anyio
 import httpx
+import logging
+import orjson
 import os
 from mcp.server.fastmcp import FastMCP
 
-# Initialize FastMCP server
-mcp = FastMCP("simplelocalize")
+logger = logging.getLogger(__name__)
 
 # Constants
 SIMPLELOCALIZE_API_BASE = "https://api.simplelocalize.io"
@@ -12,37 +17,259 @@ SIMPLELOCALIZE_API_KEY = os.getenv("SIMPLELOCALIZE_API_KEY")
 if not SIMPLELOCALIZE_API_KEY:
     raise ValueError("SIMPLELOCALIZE_API_KEY environment variable is not set")
 
+# How long (ms) bulk calls wait for concurrent calls to coalesce with; 0 disables batching
+SIMPLELOCALIZE_BATCH_MAX_WAIT_MS = float(os.getenv("SIMPLELOCALIZE_BATCH_MAX_WAIT_MS", "10"))
+
+# How long (seconds) environment status responses are cached; 0 disables caching
+SIMPLELOCALIZE_STATUS_CACHE_TTL = float(os.getenv("SIMPLELOCALIZE_STATUS_CACHE_TTL", "2"))
+
+_KEY_OPTIONAL_FIELDS = frozenset({"namespace", "description"})
+_TRANSLATION_REQUIRED_FIELDS = frozenset({"key", "language", "text"})
+_TRANSLATION_OPTIONAL_FIELDS = frozenset({"namespace"})
+
+# Fields that identify a row; rows sharing them are duplicates
+_KEY_IDENTITY_FIELDS = ("key", "namespace")
+_TRANSLATION_IDENTITY_FIELDS = ("key", "language", "namespace")
+
+class TranslationKey(TypedDict):
+    """A translation key to create."""
+    key: str
+    namespace: NotRequired[str]
+    description: NotRequired[str]
+
+class Translation(TypedDict):
+    """A translation to update."""
+    key: str
+    language: str
+    text: str
+    namespace: NotRequired[str]
+
+# Maximum field lengths accepted by the SimpleLocalize API
+_KEY_FIELD_LIMITS = {"key": 500, "namespace": 128, "description": 500}
+_TRANSLATION_FIELD_LIMITS = {"key": 500, "namespace": 128, "text": 65535}
+
+_STATUS_TEMPLATE = (
+    "Environment '{environment_key}' Status:\n"
+    "- Number of keys: {numberOfKeys}\n"
+    "- Number of languages: {numberOfLanguages}\n"
+    "- Non-empty translations: {numberOfNonEmptyTranslations}\n"
+    "- Created at: {createdAt}\n"
+    "- Number of resources: {resource_count}"
+)
+_STATUS_DEFAULTS = {
+    "numberOfKeys": 0,
+    "numberOfLanguages": 0,
+    "numberOfNonEmptyTranslations": 0,
+    "createdAt": "Unknown"
+}
+
+# Recently fetched environment statuses, keyed by environment key
+_status_cache: TTLCache[str, str] | None = (
+    TTLCache(maxsize=32, ttl=SIMPLELOCALIZE_STATUS_CACHE_TTL) if SIMPLELOCALIZE_STATUS_CACHE_TTL > 0 else None
+)
+
+# Bumped on every publish to an environment, so in-flight status fetches can tell they're stale
+_status_generations: dict[str, int] = {}
+
+_HEADERS = {
+    "X-SimpleLocalize-Token": SIMPLELOCALIZE_API_KEY,
+    "Content-Type": "application/json"
+}
+
+# Shared HTTP client so every tool call reuses pooled keep-alive connections
+_CLIENT = httpx.AsyncClient(
+    base_url=SIMPLELOCALIZE_API_BASE,
+    headers=_HEADERS,
+    # Short pool timeout so waiting for a free connection never dominates under load
+    timeout=httpx.Timeout(connect=5.0, read=30.0, write=30.0, pool=5.0),
+    http2=True,
+    limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=30.0)
+)
+
+# Initialize FastMCP server
+mcp = FastMCP("simplelocalize")
+
 class SimpleLocalizeError(Exception):
     """Custom error for SimpleLocalize API errors"""
-    pass
 
-async def make_simplelocalize_request(method: str, endpoint: str, json_data: dict | None = None) -> dict[str, Any]:
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        # HTTP status of the failed response, if the API answered at all
+        self.status_code = status_code
+
+    def __str__(self) -> str:
+        # Only format the underlying error when the message is actually needed
+        message = super().__str__()
+        if self.__cause__ is not None:
+            return f"{message}: {self.__cause__}"
+        return message
+
+_HTTPMethod = Literal["GET", "POST", "PATCH"]
+
+async def make_simplelocalize_request(method: _HTTPMethod, endpoint: str, json_data: dict | None = None) -> dict[str, Any]:
     """Make a request to the SimpleLocalize API with proper error handling."""
-    headers = {
-        "X-SimpleLocalize-Token": SIMPLELOCALIZE_API_KEY,
-        "Content-Type": "application/json"
-    }
-    
-    url = f"{SIMPLELOCALIZE_API_BASE}{endpoint}"
-    
-    async with httpx.AsyncClient() as client:
+    # Body-less requests (GET, publish) skip request encoding entirely; otherwise
+    # serialize with orjson rather than httpx's stdlib json encoder
+    kwargs = {} if json_data is None else {"content": orjson.dumps(json_data)}
+    try:
+        response = await _CLIENT.request(method, endpoint, **kwargs)
+    except httpx.HTTPError as e:
+        raise SimpleLocalizeError("SimpleLocalize API error") from e
+
+    logger.debug("%s %s -> %s %s", method, endpoint, response.http_version, response.status_code)
+    if not response.is_success:
+        raise SimpleLocalizeError(
+            f"SimpleLocalize API error: HTTP {response.status_code}: {response.text[:256]}",
+            status_code=response.status_code
+        )
+    return orjson.loads(response.content)
+
+def _dedupe_rows(rows: List[dict], identity_fields: tuple[str, ...]) -> List[dict]:
+    """Drop rows with the same identity fields, keeping the last occurrence."""
+    return list({tuple(row.get(field, "") for field in identity_fields): row for row in rows}.values())
+
+def _check_field_lengths(rows: List[dict], limits: dict[str, int]) -> None:
+    """Raise ValueError for the first row with a field longer than its limit."""
+    for i, row in enumerate(rows):
+        for field, limit in limits.items():
+            value = row.get(field)
+            if isinstance(value, str) and len(value) > limit:
+                raise ValueError(f"'{field}' at index {i} exceeds {limit} chars")
+
+# Statuses that mean the request body itself was rejected. Auth, plan and rate-limit errors
+# (401/403/429) apply to every caller, so retrying per caller would only add load.
+_ROW_REJECTION_STATUSES = frozenset({400, 422})
+
+class _BatchQueue:
+    """Coalesce concurrent calls to a SimpleLocalize bulk endpoint into fewer requests.
+
+    Rows submitted by concurrent callers are queued and sent together once `max_items`
+    rows have accumulated or `max_wait` seconds have passed since the first queued call.
+    A single caller's rows are never split across requests. Each caller receives the API
+    response of the request their rows were sent in, with `failures` narrowed down to the
+    ones matching its own rows (by `identity_fields`). If a merged request is rejected as a
+    bad request (400/422), each caller's rows are retried on their own so one caller's bad
+    input doesn't fail the others; any other error is passed to every caller as is.
+    """
+
+    def __init__(
+        self,
+        method: _HTTPMethod,
+        endpoint: str,
+        field: str,
+        identity_fields: tuple[str, ...],
+        max_wait: float,
+        max_items: int = 100
+    ):
+        self._method = method
+        self._endpoint = endpoint
+        self._field = field
+        self._identity_fields = identity_fields
+        self._max_wait = max_wait
+        self._max_items = max_items
+        self._queue: asyncio.Queue[tuple[list[dict], asyncio.Future]] = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def submit(self, rows: list[dict]) -> dict[str, Any]:
+        """Queue rows for the next bulk request and return its API response."""
+        if self._max_wait <= 0:
+            return await make_simplelocalize_request(self._method, self._endpoint, {self._field: rows})
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((rows, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        carry = None
+        while True:
+            first = carry or await self._queue.get()
+            carry = None
+            batch = [first]
+            size = len(first[0])
+            deadline = loop.time() + self._max_wait
+
+            while size < self._max_items:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                # Keep a caller's rows together; they open the next batch instead
+                if size + len(item[0]) > self._max_items:
+                    carry = item
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            # Flush in the background so the next batch can start filling immediately
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[list[dict], asyncio.Future]]) -> None:
+        # The same row may come from several callers; only send it once
+        rows = _dedupe_rows([row for caller_rows, _ in batch for row in caller_rows], self._identity_fields)
         try:
-            if method.upper() == "POST":
-                response = await client.post(url, headers=headers, json=json_data, timeout=30.0)
-            elif method.upper() == "PATCH":
-                response = await client.patch(url, headers=headers, json=json_data, timeout=30.0)
-            elif method.upper() == "GET":
-                response = await client.get(url, headers=headers, timeout=30.0)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise SimpleLocalizeError(f"SimpleLocalize API error: {str(e)}")
+            try:
+                result = await make_simplelocalize_request(self._method, self._endpoint, {self._field: rows})
+            except SimpleLocalizeError as e:
+                if len(batch) == 1 or e.status_code not in _ROW_REJECTION_STATUSES:
+                    raise
+                # Likely caused by one caller's rows: retry each caller alone so the rest still succeed
+                await asyncio.gather(*(self._flush([item]) for item in batch))
+                return
+
+            for caller_rows, future in batch:
+                if not future.done():
+                    future.set_result(result if len(batch) == 1 else self._result_for(result, caller_rows))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    def _result_for(self, result: dict[str, Any], rows: list[dict]) -> dict[str, Any]:
+        """Narrow a merged response's failures down to the ones for a single caller's rows."""
+        data = result.get("data")
+        if not isinstance(data, dict) or not data.get("failures"):
+            return result
+        failures = [failure for failure in data["failures"] if self._owns(failure, rows)]
+        return {**result, "data": {**data, "failures": failures}}
+
+    def _owns(self, failure: Any, rows: list[dict]) -> bool:
+        # A failure that doesn't say which row it is about is reported to every caller
+        if not isinstance(failure, dict) or "key" not in failure:
+            return True
+        fields = [field for field in self._identity_fields if field in failure]
+        return any(all(row.get(field, "") == failure[field] for field in fields) for row in rows)
+
+_translation_keys_batch = _BatchQueue(
+    "POST",
+    "/api/v1/translation-keys/bulk",
+    "translationKeys",
+    _KEY_IDENTITY_FIELDS,
+    SIMPLELOCALIZE_BATCH_MAX_WAIT_MS / 1000
+)
+_translations_batch = _BatchQueue(
+    "PATCH",
+    "/api/v2/translations/bulk",
+    "translations",
+    _TRANSLATION_IDENTITY_FIELDS,
+    SIMPLELOCALIZE_BATCH_MAX_WAIT_MS / 1000
+)
 
 @mcp.tool()
-async def create_translation_keys(keys: List[dict]) -> str:
+async def create_translation_keys(keys: List[TranslationKey]) -> str:
     """Create translation keys in bulk for a project.
     
     This endpoint allows you to create multiple translation keys at once. You can create up to 100 translation keys in a single request.
@@ -54,33 +281,25 @@ async def create_translation_keys(keys: List[dict]) -> str:
             - namespace (optional): Namespace for the key (max 128 chars)
             - description (optional): Description for translators (max 500 chars)
     """
+    if len(keys) > 100:
+        raise ValueError("Maximum 100 keys allowed per request")
+
     # Validate and clean input
-    cleaned_keys = []
-    for key_info in keys:
-        if not key_info.get("key"):
-            raise ValueError("Each key must have a 'key' field")
-            
-        cleaned_key = {
-            "key": key_info["key"]
-        }
-        
-        # Only include optional fields if they exist
-        if "namespace" in key_info:
-            cleaned_key["namespace"] = key_info["namespace"]
-        if "description" in key_info:
-            cleaned_key["description"] = key_info["description"]
-            
-        cleaned_keys.append(cleaned_key)
+    if not all(key_info.get("key") for key_info in keys):
+        raise ValueError("Each key must have a 'key' field")
+    _check_field_lengths(keys, _KEY_FIELD_LIMITS)
 
-    if len(cleaned_keys) > 100:
-        raise ValueError("Maximum 100 keys allowed per request")
+    # Only include optional fields if they exist, and drop duplicate keys (last one wins)
+    cleaned_keys = _dedupe_rows([
+        {
+            "key": key_info["key"],
+            **{field: key_info[field] for field in key_info.keys() & _KEY_OPTIONAL_FIELDS}
+        }
+        for key_info in keys
+    ], _KEY_IDENTITY_FIELDS)
 
     try:
-        result = await make_simplelocalize_request(
-            "POST",
-            "/api/v1/translation-keys/bulk",
-            {"translationKeys": cleaned_keys}
-        )
+        result = await _translation_keys_batch.submit(cleaned_keys)
         
         if "failures" in result.get("data", {}):
             failures = result["data"]["failures"]
@@ -92,7 +311,7 @@ async def create_translation_keys(keys: List[dict]) -> str:
         return str(e)
 
 @mcp.tool()
-async def update_translations(translations: List[dict]) -> str:
+async def update_translations(translations: List[Translation]) -> str:
     """Update translations in bulk with a single request.
     
     This endpoint allows you to update multiple translations at once. You can update up to 100 translations in a single request.
@@ -100,38 +319,32 @@ async def update_translations(translations: List[dict]) -> str:
     
     Args:
         translations: List of dictionaries containing translation information with fields:
-            - key (required): Translation key
+            - key (required): Translation key (max 500 chars)
             - language (required): Language code
             - text (required): Translation text (max 65535 chars)
-            - namespace (optional): Namespace for the key
+            - namespace (optional): Namespace for the key (max 128 chars)
     """
+    if len(translations) > 100:
+        raise ValueError("Maximum 100 translations allowed per request")
+
     # Validate and clean input
-    cleaned_translations = []
-    for trans in translations:
-        if not all(k in trans for k in ["key", "language", "text"]):
-            raise ValueError("Each translation must have 'key', 'language', and 'text' fields")
-            
-        cleaned_trans = {
+    if not all(trans.keys() >= _TRANSLATION_REQUIRED_FIELDS for trans in translations):
+        raise ValueError("Each translation must have 'key', 'language', and 'text' fields")
+    _check_field_lengths(translations, _TRANSLATION_FIELD_LIMITS)
+
+    # Only include namespace if it exists, and drop duplicate translations (last one wins)
+    cleaned_translations = _dedupe_rows([
+        {
             "key": trans["key"],
             "language": trans["language"],
-            "text": trans["text"]
+            "text": trans["text"],
+            **{field: trans[field] for field in trans.keys() & _TRANSLATION_OPTIONAL_FIELDS}
         }
-        
-        # Only include namespace if it exists
-        if "namespace" in trans:
-            cleaned_trans["namespace"] = trans["namespace"]
-            
-        cleaned_translations.append(cleaned_trans)
-
-    if len(cleaned_translations) > 100:
-        raise ValueError("Maximum 100 translations allowed per request")
+        for trans in translations
+    ], _TRANSLATION_IDENTITY_FIELDS)
 
     try:
-        result = await make_simplelocalize_request(
-            "PATCH",
-            "/api/v2/translations/bulk",
-            {"translations": cleaned_translations}
-        )
+        result = await _translations_batch.submit(cleaned_translations)
         
         if "failures" in result.get("data", {}):
             failures = result["data"]["failures"]
@@ -166,11 +379,28 @@ async def publish_translations(environment_key: str) -> str:
             "POST",
             f"/api/v2/environments/{environment_key}/publish"
         )
+
+        # Publishing changes the environment, so don't serve a stale status for it
+        _invalidate_environment_status(environment_key)
         
         return f"Successfully initiated publishing to environment '{environment_key}'. Status: {result.get('msg', 'OK')}"
     except SimpleLocalizeError as e:
         return str(e)
 
+def _invalidate_environment_status(environment_key: str) -> None:
+    """Drop an environment's cached status and keep in-flight fetches from re-caching it."""
+    _status_generations[environment_key] = _status_generations.get(environment_key, 0) + 1
+    if _status_cache is not None:
+        _status_cache.pop(environment_key, None)
+
+def _format_environment_status(environment_key: str, data: dict) -> str:
+    """Format environment status data from the API in a readable way."""
+    return _STATUS_TEMPLATE.format_map(ChainMap(
+        {"environment_key": environment_key, "resource_count": len(data.get("resources", ()))},
+        data,
+        _STATUS_DEFAULTS
+    ))
+
 @mcp.tool()
 async def get_environment_status(environment_key: str) -> str:
     """Get the current status of a specified environment.
@@ -183,6 +413,12 @@ async def get_environment_status(environment_key: str) -> str:
     """
     if not environment_key:
         raise ValueError("Environment key is required")
+
+    if _status_cache is not None:
+        cached = _status_cache.get(environment_key)
+        if cached is not None:
+            return cached
+    generation = _status_generations.get(environment_key, 0)
     
     try:
         result = await make_simplelocalize_request(
@@ -190,20 +426,57 @@ async def get_environment_status(environment_key: str) -> str:
             f"/api/v2/environments/{environment_key}"
         )
         
-        data = result.get("data", {})
-        
-        # Format the response in a readable way
-        status_info = f"""Environment '{environment_key}' Status:
-- Number of keys: {data.get('numberOfKeys', 0)}
-- Number of languages: {data.get('numberOfLanguages', 0)}
-- Non-empty translations: {data.get('numberOfNonEmptyTranslations', 0)}
-- Created at: {data.get('createdAt', 'Unknown')}
-- Number of resources: {len(data.get('resources', []))}"""
+        status_info = _format_environment_status(environment_key, result.get("data", {}))
+
+        # Don't cache a status fetched while the environment was being published to
+        if _status_cache is not None and _status_generations.get(environment_key, 0) == generation:
+            _status_cache[environment_key] = status_info
         
         return status_info
     except SimpleLocalizeError as e:
         return str(e)
 
+@mcp.tool()
+async def publish_and_get_environment_status(environment_key: str) -> str:
+    """Publish translations to a specified environment and get its status in one call.
+    
+    The publish and status requests are sent concurrently, so this takes about as long as
+    the slower of the two instead of both back to back. Since publishing runs asynchronously
+    on SimpleLocalize's side, the returned status may not reflect the publish yet.
+    
+    Args:
+        environment_key: The environment key to publish to (e.g., "_latest", "_production", or custom key)
+    """
+    if not environment_key:
+        raise ValueError("Environment key is required")
+    
+    # Gather both outcomes so a failed status fetch doesn't hide a successful publish
+    publish_result, status_result = await asyncio.gather(
+        make_simplelocalize_request("POST", f"/api/v2/environments/{environment_key}/publish"),
+        make_simplelocalize_request("GET", f"/api/v2/environments/{environment_key}"),
+        return_exceptions=True
+    )
+    for outcome in (publish_result, status_result):
+        if isinstance(outcome, BaseException) and not isinstance(outcome, SimpleLocalizeError):
+            raise outcome
+
+    if isinstance(publish_result, SimpleLocalizeError):
+        publish_info = f"Failed to publish to environment '{environment_key}': {publish_result}"
+    else:
+        # Publishing changes the environment, so don't serve a stale status for it
+        _invalidate_environment_status(environment_key)
+        publish_info = (
+            f"Successfully initiated publishing to environment '{environment_key}'. "
+            f"Status: {publish_result.get('msg', 'OK')}"
+        )
+
+    if isinstance(status_result, SimpleLocalizeError):
+        status_info = f"Failed to get status of environment '{environment_key}': {status_result}"
+    else:
+        status_info = _format_environment_status(environment_key, status_result.get("data", {}))
+
+    return f"{publish_info}\n\n{status_info}"
+
 @mcp.tool()
 async def duplicate_translation(from_dict: dict, to_dict: dict) -> str:
     """Duplicate translations from one key/namespace to another key/namespace.
@@ -505,5 +778,19 @@ async def get_translations_for_keys(keys: List[str], namespace: str = None) -> L
     except SimpleLocalizeError as e:
         return [{"error": str(e)}]
 
+async def _serve_stdio() -> None:
+    """Run the stdio server, closing the shared HTTP client once the process is done with it."""
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        await _CLIENT.aclose()
+
 if __name__ == "__main__":
-    mcp.run(transport='stdio')
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        backend_options = {}
+    else:
+        # Run on uvloop's faster event loop when it's installed
+        backend_options = {"use_uvloop": True}
+    anyio.run(_serve_stdio, backend_options=backend_options)
@@ -0,0 +1,4 @@
+import os
+
+# main.py refuses to import without an API key; tests never reach the real API
+os.environ.setdefault("SIMPLELOCALIZE_API_KEY", "test-key")
@@ -0,0 +1,108 @@
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+import main
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Route the shared client through a mock transport that records each bulk request's rows.
+
+    Set `api.respond` to a function taking the list of sent keys and returning an httpx.Response.
+    """
+    class Api:
+        requests: list[list[dict]] = []
+
+        @staticmethod
+        def respond(keys: list[str]) -> httpx.Response:
+            return httpx.Response(200, json={"data": {"failures": []}})
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        rows = orjson.loads(request.content)["translationKeys"]
+        Api.requests.append(rows)
+        return Api.respond([row["key"] for row in rows])
+
+    Api.requests = []
+    monkeypatch.setattr(
+        main, "_CLIENT", httpx.AsyncClient(base_url="https://api.test", transport=httpx.MockTransport(handler))
+    )
+    return Api
+
+
+def use_queue(monkeypatch, max_wait: float = 0.05) -> main._BatchQueue:
+    # A fresh queue per test, since an asyncio.Queue is bound to the event loop it was first used on
+    queue = main._BatchQueue(
+        "POST", "/api/v1/translation-keys/bulk", "translationKeys", main._KEY_IDENTITY_FIELDS, max_wait
+    )
+    monkeypatch.setattr(main, "_translation_keys_batch", queue)
+    return queue
+
+
+def create_concurrently(*key_lists: list[str]) -> list[str]:
+    async def run():
+        return await asyncio.gather(
+            *(main.create_translation_keys([{"key": key} for key in keys]) for keys in key_lists)
+        )
+    return asyncio.run(run())
+
+
+def test_concurrent_calls_are_merged_into_one_request(api, monkeypatch):
+    use_queue(monkeypatch)
+
+    results = create_concurrently(["a", "b"], ["c"])
+
+    assert results == ["Successfully created 2 translation keys", "Successfully created 1 translation keys"]
+    assert api.requests == [[{"key": "a"}, {"key": "b"}, {"key": "c"}]]
+
+
+def test_rows_sent_by_several_callers_are_sent_once(api, monkeypatch):
+    use_queue(monkeypatch)
+
+    create_concurrently(["dup"], ["dup"])
+
+    assert api.requests == [[{"key": "dup"}]]
+
+
+def test_failures_are_reported_only_to_the_caller_that_sent_the_row(api, monkeypatch):
+    use_queue(monkeypatch)
+    api.respond = lambda keys: httpx.Response(
+        200, json={"data": {"failures": [{"key": key} for key in keys if key.startswith("bad")]}}
+    )
+
+    results = create_concurrently(["good"], ["bad1"])
+
+    assert len(api.requests) == 1
+    assert results == ["Successfully created 1 translation keys", "Some keys failed to create: [{'key': 'bad1'}]"]
+
+
+def test_bad_request_is_retried_per_caller(api, monkeypatch):
+    use_queue(monkeypatch)
+    api.respond = lambda keys: httpx.Response(400, text="bad row") if "reject" in keys else httpx.Response(200, json={})
+
+    results = create_concurrently(["good"], ["reject"])
+
+    assert results == ["Successfully created 1 translation keys", "SimpleLocalize API error: HTTP 400: bad row"]
+    assert api.requests == [[{"key": "good"}, {"key": "reject"}], [{"key": "good"}], [{"key": "reject"}]]
+
+
+@pytest.mark.parametrize("status", [401, 403, 429])
+def test_non_row_errors_are_not_retried(api, monkeypatch, status):
+    use_queue(monkeypatch)
+    api.respond = lambda keys: httpx.Response(status, text="nope")
+
+    results = create_concurrently(["a"], ["b"], ["c"])
+
+    assert results == [f"SimpleLocalize API error: HTTP {status}: nope"] * 3
+    assert len(api.requests) == 1
+
+
+def test_zero_max_wait_sends_each_call_immediately(api, monkeypatch):
+    queue = use_queue(monkeypatch, max_wait=0)
+
+    create_concurrently(["a"], ["b"])
+
+    assert sorted(api.requests, key=str) == [[{"key": "a"}], [{"key": "b"}]]
+    assert queue._worker is None